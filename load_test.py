@@ -0,0 +1,395 @@
+# -*- coding: utf-8 -*-
+"""
+WEB CONTENT MANAGER - Multi-session load test harness
+
+Drives main() headlessly through Streamlit's AppTest across many simulated owner, guest and
+public sessions doing a mix of add/browse/export/delete, with a local HTTP stand-in serving the
+pages fetch_metadata reads. Reports rerun latency percentiles, per-session memory and file I/O.
+
+    python load_test.py --owners 2 --guests 10 --public 20 --ops 500
+    python load_test.py --ops 300 --save-baseline baseline.json
+    python load_test.py --ops 300 --baseline baseline.json --tolerance 0.25
+
+AppTest swaps a process-global runtime on every run, so sessions are interleaved on one thread:
+all sessions stay alive and share the app's process-wide caches, but reruns never overlap.
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+import streamlit_option_menu
+from streamlit.proto.WidgetStates_pb2 import WidgetStates
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.element_tree import get_widget_state
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "web_content_ai_public.py")
+ACTION_WEIGHTS = {'add': 0.4, 'browse': 0.3, 'export': 0.15, 'delete': 0.15}
+SEARCH_WORDS = ['python', 'data', 'news', 'guide', 'tool', 'page']
+TOPICS = ['python', 'data', 'news', 'design', 'cooking', 'travel', 'music', 'tool']
+
+class _PageHandler(BaseHTTPRequestHandler):
+    """Stand-in web page with a title, description and keywords derived from the path"""
+
+    latency = 0.05
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        slug = self.path.rstrip('/').rsplit('/', 1)[-1]
+        topic = TOPICS[sum(map(ord, slug)) % len(TOPICS)]
+        body = (f"<html><head><title>{topic.title()} page {slug}</title>"
+                f"<meta name='description' content='A {topic} guide for load testing'>"
+                f"<meta name='keywords' content='{topic}, guide, page'></head>"
+                f"<body>{'lorem ipsum ' * 200}</body></html>").encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_page_server(latency):
+    """Serve stand-in pages from a child process so its socket I/O stays out of our counters"""
+    _PageHandler.latency = latency
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _PageHandler)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    process = multiprocessing.get_context("fork").Process(target=server.serve_forever, daemon=True)
+    process.start()
+    server.socket.close()
+    return base_url, process
+
+def _option_menu(menu_title, options, default_index=0, **kwargs):
+    """AppTest cannot drive custom components; navigate from session state instead"""
+    _capture_public_registry()
+    return st.session_state.get('_load_test_nav', options[default_index])
+
+_original_data_editor = st.data_editor
+
+def _data_editor(data, *args, **kwargs):
+    """Tick the Select box for URLs the harness wants deleted (AppTest cannot edit data_editor)"""
+    result = _original_data_editor(data, *args, **kwargs)
+    chosen = st.session_state.get('_load_test_select')
+    if chosen and 'Select' in result.columns:
+        result = result.copy()
+        result['Select'] = result['url'].isin(chosen)
+    return result
+
+def install_widget_stand_ins():
+    streamlit_option_menu.option_menu = _option_menu
+    st.data_editor = _data_editor
+
+def _process_io():
+    """Bytes read/written through syscalls by this process (Linux only)"""
+    try:
+        with open('/proc/self/io') as f:
+            fields = dict(line.split(': ') for line in f.read().splitlines())
+        return int(fields['rchar']), int(fields['wchar'])
+    except (OSError, KeyError, ValueError):
+        return 0, 0
+
+def _process_rss():
+    """Resident set size of this process in bytes (Linux only)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+def _object_bytes(value):
+    """Approximate memory held by a session state value"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+# Streamlit 1.31 AppTest internals. AppTest has no public API for sending a hand-built
+# widget state list or walking the element tree. The app's cache_resource registry is keyed
+# by module name (the script runs as __main__) and only returns cached values inside a
+# script run, so it is read from within the app's rerun. Every reliance on Streamlit
+# internals lives here; revisit this block when upgrading Streamlit.
+
+_captured = {}
+
+def _apptest_run(at, widget_states):
+    """Rerun the script with the given WidgetStates"""
+    at._run(widget_states)
+
+def _apptest_nodes(at):
+    """Element nodes from the last run"""
+    return at._tree
+
+def _capture_public_registry():
+    """Call the running app's _public_registry(); the script runner installs it as __main__"""
+    registry = getattr(sys.modules['__main__'], '_public_registry', None)
+    if registry is not None:
+        _captured['public_registry'] = registry()
+
+def _public_registry():
+    """The app's process-wide public session registry, if a session has run"""
+    return _captured.get('public_registry')
+
+class SimSession:
+    """One simulated browser session"""
+
+    def __init__(self, kind, number, base_url, timeout):
+        self.kind = kind
+        self.name = f"{kind}-{number}"
+        self.base_url = base_url
+        self.urls = []
+        self.added = 0
+        self.at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self.at.session_state['mode'] = kind
+        if kind == "guest":
+            self.at.session_state['username'] = f"load{number}"
+
+    def run(self, stats, action):
+        """Rerun the app once, recording latency, I/O and errors"""
+        read_before, write_before = _process_io()
+        start = time.perf_counter()
+        _apptest_run(self.at, self._widget_states())
+        stats.latency[(self.kind, action)].append((time.perf_counter() - start) * 1000)
+        read_after, write_after = _process_io()
+        stats.read_bytes += read_after - read_before
+        stats.write_bytes += write_after - write_before
+        stats.reruns += 1
+        if len(self.at.exception):
+            stats.errors.append(f"{self.name}/{action}: {self.at.exception[0].value}")
+
+    def _widget_states(self):
+        """Widget states to send with the next rerun, like AppTest.run() collects them.
+
+        After an in-script st.rerun() AppTest can keep nodes for widgets that no longer exist or
+        whose options changed; a browser would not send those, so they are skipped here.
+        """
+        states = WidgetStates()
+        for node in _apptest_nodes(self.at):
+            try:
+                state = get_widget_state(node)
+            except (KeyError, ValueError):
+                continue
+            if state is not None:
+                states.widgets.append(state)
+        return states
+
+    def navigate(self, stats, page, action):
+        self.at.session_state['_load_test_nav'] = page
+        self.run(stats, action)
+
+    def _button(self, label=None, key=None):
+        # Latest match: stale nodes from before an in-script st.rerun() come first
+        for button in reversed(self.at.button):
+            if (label and button.label == label) or (key and button.key == key):
+                return button
+        return None
+
+    def add(self, stats):
+        self.navigate(stats, "Add Link", 'add')
+        counter = self.at.session_state['url_input_counter'] if 'url_input_counter' in self.at.session_state else 0
+        url = f"{self.base_url}/page/{self.name}-{self.added}"
+        self.added += 1
+        self.at.text_input(key=f"url_input_{counter}").input(url)
+        self.run(stats, 'add')
+        title_input = self.at.text_input(key=f"title_input_{counter}")
+        if not title_input.value:
+            title_input.input(f"Link {self.name} {self.added}")
+        self.at.text_input(key="new_tag_input").input(random.choice(TOPICS))
+        submit = self._button(label="💾 Save Link")
+        if submit is not None:
+            submit.click()
+            self.run(stats, 'add')
+            self.urls.append(url)
+
+    def browse(self, stats):
+        self.navigate(stats, "Browse Links", 'browse')
+        search = self._button(label="🔍 Search")
+        if search is not None and random.random() < 0.5:
+            self.at.text_input(key="search_query").input(random.choice(SEARCH_WORDS))
+            search.click()
+            self.run(stats, 'browse')
+
+    def export(self, stats):
+        self.navigate(stats, "Export Data", 'export')
+
+    def delete(self, stats):
+        if not self.urls:
+            return self.browse(stats)
+        chosen = random.sample(self.urls, min(len(self.urls), random.randint(1, 3)))
+        self.at.session_state['_load_test_select'] = chosen
+        self.navigate(stats, "Browse Links", 'delete')
+        button = self._button(key="delete_selected")
+        if button is not None:
+            button.click()
+            self.run(stats, 'delete')
+            self.urls = [url for url in self.urls if url not in chosen]
+        self.at.session_state['_load_test_select'] = []
+
+    def memory_bytes(self, registry):
+        """Approximate memory attributable to this session"""
+        state = self.at.session_state.filtered_state
+        size = sum(_object_bytes(value) for value in state.values())
+        if registry is not None and self.kind == "public":
+            entry = registry['sessions'].get(state.get('public_session_id'))
+            if entry is not None and entry['df'] is not None:
+                size += entry['bytes']
+        return size
+
+class Stats:
+    def __init__(self):
+        self.latency = defaultdict(list)
+        self.read_bytes = 0
+        self.write_bytes = 0
+        self.reruns = 0
+        self.errors = []
+
+def _percentiles(values):
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {'n': len(values), 'p50': p50, 'p95': p95, 'p99': p99, 'max': max(values)}
+
+def build_report(stats, sessions, elapsed, workdir):
+    registry = _public_registry()
+    all_latencies = [v for values in stats.latency.values() for v in values]
+    memory = defaultdict(list)
+    for session in sessions:
+        memory[session.kind].append(session.memory_bytes(registry))
+    disk_bytes = sum(os.path.getsize(os.path.join(root, name))
+                     for root, _, names in os.walk(workdir) for name in names)
+    spilled = registry and sum(1 for e in registry['sessions'].values() if e['df'] is None)
+    return {
+        'elapsed_seconds': elapsed,
+        'reruns': stats.reruns,
+        'reruns_per_second': stats.reruns / elapsed if elapsed else 0,
+        'latency_ms': {f"{kind}/{action}": _percentiles(values)
+                       for (kind, action), values in sorted(stats.latency.items())},
+        'overall_latency_ms': _percentiles(all_latencies) if all_latencies else {},
+        'session_memory_bytes': {kind: {'sessions': len(values), 'mean': float(np.mean(values)), 'max': max(values)}
+                                 for kind, values in memory.items()},
+        'public_spilled_sessions': spilled or 0,
+        'io': {
+            'read_bytes': stats.read_bytes,
+            'write_bytes': stats.write_bytes,
+            'read_per_rerun': stats.read_bytes / max(stats.reruns, 1),
+            'write_per_rerun': stats.write_bytes / max(stats.reruns, 1),
+            'data_on_disk_bytes': disk_bytes
+        },
+        'process': {
+            'rss_bytes': _process_rss(),
+            'traced_peak_bytes': tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None
+        },
+        'errors': stats.errors
+    }
+
+def print_report(report):
+    kb = 1024.0
+    print(f"\n{report['reruns']} reruns in {report['elapsed_seconds']:.1f}s "
+          f"({report['reruns_per_second']:.1f} reruns/s)\n")
+    print(f"{'Rerun latency (ms)':<24}{'n':>6}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    rows = list(report['latency_ms'].items()) + [('overall', report['overall_latency_ms'])]
+    for name, p in rows:
+        if p:
+            print(f"  {name:<22}{p['n']:>6}{p['p50']:>9.1f}{p['p95']:>9.1f}{p['p99']:>9.1f}{p['max']:>9.1f}")
+    print(f"\n{'Session memory (KB)':<24}{'sessions':>9}{'mean':>10}{'max':>10}")
+    for kind, m in report['session_memory_bytes'].items():
+        print(f"  {kind:<22}{m['sessions']:>9}{m['mean'] / kb:>10.1f}{m['max'] / kb:>10.1f}")
+    print(f"  public sessions spilled to disk: {report['public_spilled_sessions']}")
+    io = report['io']
+    print(f"\nFile I/O: read {io['read_bytes'] / kb / kb:.1f} MB, wrote {io['write_bytes'] / kb / kb:.1f} MB "
+          f"({io['read_per_rerun'] / kb:.1f} / {io['write_per_rerun'] / kb:.1f} KB per rerun), "
+          f"{io['data_on_disk_bytes'] / kb:.1f} KB on disk")
+    process = report['process']
+    traced = f", traced peak {process['traced_peak_bytes'] / kb / kb:.1f} MB" if process['traced_peak_bytes'] else ""
+    print(f"Process RSS {process['rss_bytes'] / kb / kb:.1f} MB{traced}")
+    if report['errors']:
+        print(f"\n{len(report['errors'])} error(s), first: {report['errors'][0]}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the Web Content Manager Streamlit app")
+    parser.add_argument("--owners", type=int, default=2)
+    parser.add_argument("--guests", type=int, default=8)
+    parser.add_argument("--public", type=int, default=16)
+    parser.add_argument("--ops", type=int, default=200, help="Total user actions across all sessions")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fetch-latency", type=float, default=0.05, help="Stand-in page delay in seconds")
+    parser.add_argument("--timeout", type=float, default=60, help="Per-rerun timeout in seconds")
+    parser.add_argument("--workdir", help="Directory for owner/guest data (a fresh temp dir by default)")
+    parser.add_argument("--tracemalloc", action="store_true", help="Track Python allocation peak (slower)")
+    parser.add_argument("--json", dest="json_out", help="Write the report as JSON")
+    parser.add_argument("--save-baseline", help="Write the report as a baseline for later runs")
+    parser.add_argument("--baseline", help="Fail if overall p95 regresses against this baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p95 regression (fraction)")
+    args = parser.parse_args(argv)
+
+    for name in ['json_out', 'save_baseline', 'baseline']:
+        if getattr(args, name):
+            setattr(args, name, os.path.abspath(getattr(args, name)))
+    random.seed(args.seed)
+    logging.disable(logging.INFO)
+    workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix="wcm_load_"))
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    install_widget_stand_ins()
+    base_url, page_server = start_page_server(args.fetch_latency)
+    sessions = ([SimSession("owner", i, base_url, args.timeout) for i in range(args.owners)] +
+                [SimSession("guest", i, base_url, args.timeout) for i in range(args.guests)] +
+                [SimSession("public", i, base_url, args.timeout) for i in range(args.public)])
+    if not sessions:
+        parser.error("At least one session is required")
+
+    stats = Stats()
+    start = time.perf_counter()
+    try:
+        for session in sessions:
+            session.run(stats, 'start')
+        actions, weights = zip(*ACTION_WEIGHTS.items())
+        for step in range(args.ops):
+            session = random.choice(sessions)
+            getattr(session, random.choices(actions, weights)[0])(stats)
+            if (step + 1) % 50 == 0:
+                print(f"  {step + 1}/{args.ops} actions, {stats.reruns} reruns", file=sys.stderr)
+    finally:
+        elapsed = time.perf_counter() - start
+        page_server.terminate()
+
+    report = build_report(stats, sessions, elapsed, workdir)
+    print(f"Data directory: {workdir}")
+    print_report(report)
+    for path in filter(None, [args.json_out, args.save_baseline]):
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2, default=float)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline_p95 = json.load(f)['overall_latency_ms']['p95']
+        current_p95 = report['overall_latency_ms'].get('p95', 0)
+        if current_p95 > baseline_p95 * (1 + args.tolerance):
+            print(f"\nREGRESSION: overall p95 {current_p95:.1f} ms vs baseline {baseline_p95:.1f} ms")
+            return 1
+        print(f"\nOK: overall p95 {current_p95:.1f} ms vs baseline {baseline_p95:.1f} ms")
+    if stats.errors:
+        print(f"\nFAILED: {len(stats.errors)} rerun(s) raised exceptions")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
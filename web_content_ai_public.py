@@ -10,8 +10,23 @@ from bs4 import BeautifulSoup
 from streamlit_option_menu import option_menu
 import logging
 import os
+import re
+import sqlite3
+import tempfile
+import threading
 import time
+import uuid
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import closing, contextmanager
 from io import BytesIO
+from urllib.parse import urlparse
+import numpy as np
+from scipy import sparse
+try:
+    import fcntl
+except ImportError:  # Windows: storage_lock degrades to a no-op
+    fcntl = None
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
@@ -32,6 +47,26 @@ st.set_page_config(
 ADMIN_PASSWORD = "admin123"
 GUEST_PASSWORD = "guest456"
 
+# Background metadata fetching
+METADATA_WORKERS = 4
+METADATA_CACHE_SIZE = 256
+METADATA_TTL_SECONDS = 600
+METADATA_POLL_SECONDS = 1
+
+# Tags offered when the library has nothing better to suggest
+DEFAULT_TAGS = ['research', 'tutorial', 'news', 'tool', 'inspiration']
+
+# Shared store for all guest libraries, partitioned by username
+GUEST_DB_FILE = os.environ.get("GUEST_DB_FILE", "guest_links.db")
+GUEST_STORE_PREFIX = "guest_db:"
+GUEST_STATS_TTL_SECONDS = 30
+
+# Public session limits (override via environment)
+PUBLIC_SESSION_MAX_BYTES = int(os.environ.get("PUBLIC_SESSION_MAX_BYTES", 20 * 1024 * 1024))
+PUBLIC_SPILL_BYTES = int(os.environ.get("PUBLIC_SPILL_BYTES", 2 * 1024 * 1024))
+PUBLIC_TOTAL_MEMORY_BYTES = int(os.environ.get("PUBLIC_TOTAL_MEMORY_BYTES", 256 * 1024 * 1024))
+PUBLIC_IDLE_TTL_SECONDS = int(os.environ.get("PUBLIC_IDLE_TTL_SECONDS", 30 * 60))
+
 # Custom CSS
 st.markdown("""
 <style>
@@ -124,55 +159,401 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def init_data(mode, username=None):
-    """Initialize or load Excel file based on mode"""
+@st.cache_resource
+def _public_registry():
+    """Process-wide registry of public session datasets"""
+    return {
+        'lock': threading.Lock(),
+        'sessions': {},
+        'spill_dir': tempfile.mkdtemp(prefix="wcm_public_")
+    }
+
+def _format_bytes(size):
+    """Human readable byte count"""
+    for unit in ['B', 'KB', 'MB']:
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+def _df_memory_bytes(df):
+    """Approximate in-memory size of a DataFrame"""
+    try:
+        return int(df.memory_usage(index=True, deep=True).sum())
+    except Exception:
+        return 0
+
+def _public_session_id():
+    """Stable id for the current public session"""
+    if 'public_session_id' not in st.session_state:
+        st.session_state['public_session_id'] = uuid.uuid4().hex
+    return st.session_state['public_session_id']
+
+def _drop_public_entry(registry, session_id):
+    """Remove a public session entry and its spill file (caller holds the lock)"""
+    entry = registry['sessions'].pop(session_id, None)
+    if entry and entry['spill_path'] and os.path.exists(entry['spill_path']):
+        try:
+            os.remove(entry['spill_path'])
+        except OSError as e:
+            logging.error(f"Failed to remove spill file {entry['spill_path']}: {str(e)}")
+
+def evict_idle_public_sessions():
+    """Evict public datasets idle for longer than PUBLIC_IDLE_TTL_SECONDS"""
+    registry = _public_registry()
+    now = time.time()
+    with registry['lock']:
+        expired = [sid for sid, entry in registry['sessions'].items()
+                   if now - entry['last_access'] > PUBLIC_IDLE_TTL_SECONDS]
+        for sid in expired:
+            _drop_public_entry(registry, sid)
+    if expired:
+        logging.info(f"Evicted {len(expired)} idle public session(s)")
+    return len(expired)
+
+def release_public_session():
+    """Free the current session's public dataset"""
+    if 'public_session_id' not in st.session_state:
+        return
+    registry = _public_registry()
+    with registry['lock']:
+        _drop_public_entry(registry, st.session_state['public_session_id'])
+
+def get_public_df():
+    """Return this session's public DataFrame, reloading it from disk if spilled"""
+    registry = _public_registry()
+    session_id = _public_session_id()
+    expired = False
+    with registry['lock']:
+        entry = registry['sessions'].get(session_id)
+        if entry is None:
+            expired = st.session_state.get('public_session_active', False)
+            entry = {
+                'df': pd.DataFrame(columns=[
+                    'id', 'url', 'title', 'description', 'tags',
+                    'created_at', 'updated_at'
+                ]),
+                'bytes': 0,
+                'spill_path': None,
+                'last_access': time.time()
+            }
+            registry['sessions'][session_id] = entry
+        entry['last_access'] = time.time()
+        df, spill_path = entry['df'], entry['spill_path']
+
+    st.session_state['public_session_active'] = True
+    if expired:
+        st.warning(f"⏳ Your temporary links were cleared after {PUBLIC_IDLE_TTL_SECONDS // 60} minutes of inactivity.")
+
+    if df is None:
+        try:
+            df = pd.read_pickle(spill_path)
+        except Exception as e:
+            st.error(f"Failed to reload your temporary links: {str(e)}")
+            logging.error(f"Spill reload failed for {spill_path}: {str(e)}")
+            df = pd.DataFrame(columns=[
+                'id', 'url', 'title', 'description', 'tags',
+                'created_at', 'updated_at'
+            ])
+    else:
+        # Callers edit the frame in place (save_link uses df.at); only set_public_df swaps the stored one
+        df = df.copy()
+    return df
+
+def set_public_df(df):
+    """Store this session's public DataFrame, spilling large datasets to disk"""
+    registry = _public_registry()
+    session_id = _public_session_id()
+    with registry['lock']:
+        previous = registry['sessions'].get(session_id, {})
+    link_indexes = previous.get('link_indexes')
+    index_bytes = sum(index.memory_bytes() for index in link_indexes['indexes'].values()) if link_indexes else 0
+    size = _df_memory_bytes(df)
+    if size + index_bytes > PUBLIC_SESSION_MAX_BYTES:
+        st.error(f"Public session limit reached ({_format_bytes(size + index_bytes)} of "
+                 f"{_format_bytes(PUBLIC_SESSION_MAX_BYTES)}). Download your links and remove some before adding more.")
+        logging.warning(f"Public session over limit: {size} + {index_bytes} index bytes")
+        return False
+
+    with registry['lock']:
+        resident = sum((entry['bytes'] if entry['df'] is not None else 0) + entry.get('index_bytes', 0)
+                       for sid, entry in registry['sessions'].items() if sid != session_id)
+    spill = size > PUBLIC_SPILL_BYTES or resident + size + index_bytes > PUBLIC_TOTAL_MEMORY_BYTES
+
+    spill_path = os.path.join(registry['spill_dir'], f"{session_id}.pkl")
+    if spill:
+        try:
+            df.to_pickle(spill_path)
+            logging.debug(f"Spilled public session {session_id} ({size} bytes) to {spill_path}")
+        except Exception as e:
+            logging.error(f"Spill to disk failed, keeping in memory: {str(e)}")
+            spill = False
+
+    with registry['lock']:
+        registry['sessions'][session_id] = {
+            'df': None if spill else df,
+            'bytes': size,
+            'spill_path': spill_path if spill else None,
+            'last_access': time.time(),
+            'version': previous.get('version', 0) + 1,
+            'index_bytes': index_bytes
+        }
+        if link_indexes is not None:
+            registry['sessions'][session_id]['link_indexes'] = link_indexes
+    if not spill and os.path.exists(spill_path):
+        os.remove(spill_path)
+    st.session_state['public_session_active'] = True
+    return True
+
+def _update_public_index_bytes():
+    """Recount the memory held by this session's public indexes"""
+    registry = _public_registry()
+    with registry['lock']:
+        entry = registry['sessions'].get(_public_session_id())
+        if entry is not None:
+            holder = entry.get('link_indexes') or {'indexes': {}}
+            entry['index_bytes'] = sum(index.memory_bytes() for index in holder['indexes'].values())
+
+def public_memory_stats():
+    """Aggregate memory usage across all public sessions"""
+    registry = _public_registry()
+    with registry['lock']:
+        entries = list(registry['sessions'].values())
+    return {
+        'sessions': len(entries),
+        'resident_bytes': sum((e['bytes'] if e['df'] is not None else 0) + e.get('index_bytes', 0)
+                              for e in entries),
+        'spilled_sessions': sum(1 for e in entries if e['df'] is None),
+        'spilled_bytes': sum(e['bytes'] for e in entries if e['df'] is None)
+    }
+
+def _parse_links(df):
+    """Normalize stored link columns (comma separated tags, text fields)"""
+    if 'tags' in df.columns:
+        df['tags'] = df['tags'].apply(lambda x: x.split(',') if isinstance(x, str) else [] if pd.isna(x) else x)
+    for col in ['title', 'url', 'description']:
+        if col in df.columns:
+            df[col] = df[col].astype(str).replace('nan', '')
+    return df
+
+def _guest_username(storage_target):
+    """Username for a guest store target, or None for a workbook path"""
+    if storage_target and storage_target.startswith(GUEST_STORE_PREFIX):
+        return storage_target[len(GUEST_STORE_PREFIX):]
+    return None
+
+_guest_dbs_ready = set()
+_guest_db_setup_lock = threading.Lock()
+
+@st.cache_resource
+def _set_up_guest_db(path):
+    """Switch the guest database to WAL and create or migrate its schema"""
+    with closing(sqlite3.connect(path, timeout=30)) as conn, conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS guest_tenants (
+                username TEXT PRIMARY KEY,
+                created_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS guest_links (
+                username TEXT NOT NULL,
+                id INTEGER,
+                url TEXT NOT NULL,
+                title TEXT,
+                description TEXT,
+                tags TEXT,
+                created_at TEXT,
+                updated_at TEXT
+            );
+            DROP INDEX IF EXISTS idx_guest_links_user_url;
+            DELETE FROM guest_links WHERE rowid NOT IN (
+                SELECT MAX(rowid) FROM guest_links GROUP BY username, url
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_guest_links_user_url_key ON guest_links (username, url);
+        """)
+    return True
+
+def _guest_db():
+    """Open the guest database, setting it up on first use in this process.
+
+    st.cache_resource only hits inside a script run, and the app module is re-executed on
+    every rerun, so the module-level flag covers the API/CLI and the cache covers Streamlit.
+    """
+    if GUEST_DB_FILE not in _guest_dbs_ready:
+        with _guest_db_setup_lock:
+            if GUEST_DB_FILE not in _guest_dbs_ready:
+                _set_up_guest_db(GUEST_DB_FILE)
+                _guest_dbs_ready.add(GUEST_DB_FILE)
+    return sqlite3.connect(GUEST_DB_FILE, timeout=30)
+
+def _write_guest_links(conn, username, df_to_save):
+    """Upsert a guest's new or changed rows and delete removed URLs; tags must already be
+    comma joined (caller commits)"""
+    def value(v):
+        return None if pd.isna(v) else v
+
+    rows = {
+        row['url']: (None if pd.isna(row['id']) else int(row['id']), value(row['title']),
+                     value(row['description']), row['tags'] or None,
+                     value(row['created_at']), value(row['updated_at']))
+        for row in df_to_save.to_dict('records')
+    }
+    stored = {
+        url: tuple(rest) for url, *rest in conn.execute(
+            "SELECT url, id, title, description, tags, created_at, updated_at "
+            "FROM guest_links WHERE username = ?", (username,))
+    }
+    conn.executemany("DELETE FROM guest_links WHERE username = ? AND url = ?",
+                     [(username, url) for url in stored.keys() - rows.keys()])
+    conn.executemany(
+        "INSERT INTO guest_links (username, url, id, title, description, tags, created_at, updated_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT (username, url) DO UPDATE SET id = excluded.id, title = excluded.title, "
+        "description = excluded.description, tags = excluded.tags, "
+        "created_at = excluded.created_at, updated_at = excluded.updated_at",
+        [(username, url) + row for url, row in rows.items() if stored.get(url) != row])
+
+def _load_guest_links(username):
+    """Load one guest's links, importing a legacy guest_{username}.xlsx on first login"""
+    with closing(_guest_db()) as conn:
+        with conn:
+            # OR IGNORE: concurrent first logins (two tabs, UI and API) must not fail; only the
+            # one that registered the guest imports the legacy workbook
+            registered = conn.execute(
+                "INSERT OR IGNORE INTO guest_tenants (username, created_at) VALUES (?, ?)",
+                (username, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))).rowcount
+            legacy_file = f'guest_{username}.xlsx'
+            if registered:
+                if os.path.exists(legacy_file):
+                    legacy_df = pd.read_excel(legacy_file, engine='openpyxl').reindex(columns=[
+                        'id', 'url', 'title', 'description', 'tags', 'created_at', 'updated_at'
+                    ])
+                    legacy_df['tags'] = legacy_df['tags'].fillna('').astype(str)
+                    for col in ['url', 'title', 'description', 'created_at', 'updated_at']:
+                        legacy_df[col] = legacy_df[col].fillna('').astype(str)
+                    _write_guest_links(conn, username, legacy_df)
+                    logging.info(f"Imported {len(legacy_df)} links from {legacy_file}")
+        df = pd.read_sql_query(
+            "SELECT id, url, title, description, tags, created_at, updated_at "
+            "FROM guest_links WHERE username = ? ORDER BY rowid", conn, params=(username,))
+    return _parse_links(df)
+
+def guest_stats():
+    """Per-guest link counts and last activity across the guest store"""
+    with closing(_guest_db()) as conn:
+        return pd.read_sql_query("""
+            SELECT t.username AS guest,
+                   COUNT(l.url) AS links,
+                   t.created_at AS joined,
+                   MAX(l.updated_at) AS last_updated
+            FROM guest_tenants t
+            LEFT JOIN guest_links l ON l.username = t.username
+            GROUP BY t.username
+            ORDER BY links DESC, guest
+        """, conn)
+
+@st.cache_data(ttl=GUEST_STATS_TTL_SECONDS, show_spinner=False)
+def cached_guest_stats():
+    """guest_stats for the owner sidebar, re-queried at most every GUEST_STATS_TTL_SECONDS"""
+    return guest_stats()
+
+def storage_target_for(mode, username=None):
+    """Storage target for a mode: the owner workbook, a guest's rows, or None for public"""
     if mode == "owner":
-        excel_file = 'web_links.xlsx'
-    elif mode == "guest":
+        return 'web_links.xlsx'
+    if mode == "guest":
         if not username:
             raise ValueError("Username required for guest mode")
-        excel_file = f'guest_{username}.xlsx'
-    else:
+        return f'{GUEST_STORE_PREFIX}{username}'
+    return None
+
+def init_data(mode, username=None):
+    """Load the links for a mode and return them with the storage target.
+
+    The target is the owner's Excel file or 'guest_db:<username>' for a guest's rows in the
+    shared guest database; public mode has none and keeps its links in the session registry.
+    """
+    storage_target = storage_target_for(mode, username)
+    if storage_target is None:
         return pd.DataFrame(), None  # Public mode uses session state
     
     try:
-        if os.path.exists(excel_file):
-            df = pd.read_excel(excel_file, engine='openpyxl')
-            if 'tags' in df.columns:
-                df['tags'] = df['tags'].apply(lambda x: x.split(',') if isinstance(x, str) else [] if pd.isna(x) else x)
-            for col in ['title', 'url', 'description']:
-                if col in df.columns:
-                    df[col] = df[col].astype(str).replace('nan', '')
-            logging.info(f"Loaded {excel_file}")
+        if _guest_username(storage_target) is not None:
+            df = _load_guest_links(username)
+            logging.info(f"Loaded {len(df)} links for guest {username}")
+        elif os.path.exists(storage_target):
+            df = _parse_links(pd.read_excel(storage_target, engine='openpyxl'))
+            logging.info(f"Loaded {storage_target}")
         else:
             df = pd.DataFrame(columns=[
                 'id', 'url', 'title', 'description', 'tags', 
                 'created_at', 'updated_at'
             ])
-            logging.info(f"Created new {excel_file}")
-        return df, excel_file
+            logging.info(f"Created new {storage_target}")
+        return df, storage_target
     except Exception as e:
-        st.error(f"Failed to initialize {excel_file}: {str(e)}")
+        st.error(f"Failed to initialize {storage_target}: {str(e)}")
         logging.error(f"Data initialization failed: {str(e)}")
-        return pd.DataFrame(), excel_file
+        return pd.DataFrame(), storage_target
+
+def flatten_tags(df):
+    """Copy of a links DataFrame with tag lists joined by commas, as stored on disk"""
+    flat = df.copy()
+    if 'tags' in flat.columns:
+        flat['tags'] = flat['tags'].apply(lambda x: ','.join(map(str, x)) if isinstance(x, list) else '')
+    return flat
+
+def _storage_path(storage_target):
+    """File backing a storage target (all guests share the guest database)"""
+    return GUEST_DB_FILE if _guest_username(storage_target) is not None else storage_target
 
-def save_data(df, excel_file):
-    """Save DataFrame to Excel file"""
+@contextmanager
+def storage_lock(storage_target):
+    """Exclusive cross-process lock on a storage target for load-modify-save cycles"""
+    if fcntl is None:
+        yield
+        return
+    with open(_storage_path(storage_target) + '.lock', 'a') as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+def storage_version(storage_target):
+    """Modification marker for a storage target; changes whenever another writer saves"""
+    path = _storage_path(storage_target)
+    version = []
+    for candidate in (path, path + '-wal') if path == GUEST_DB_FILE else (path,):
+        try:
+            stat = os.stat(candidate)
+            version.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            version.append(None)
+    return tuple(version)
+
+def save_data(df, storage_target):
+    """Save DataFrame to its storage target (owner Excel file or guest database)"""
     try:
-        logging.debug(f"Saving DataFrame to {excel_file}: {df.to_dict()}")
-        df_to_save = df.copy()
-        if 'tags' in df_to_save.columns:
-            df_to_save['tags'] = df_to_save['tags'].apply(lambda x: ','.join(map(str, x)) if isinstance(x, list) else '')
+        logging.debug(f"Saving DataFrame to {storage_target}: {len(df)} rows")
+        df_to_save = flatten_tags(df)
+        
+        guest = _guest_username(storage_target)
+        if guest is not None:
+            with closing(_guest_db()) as conn, conn:
+                _write_guest_links(conn, guest, df_to_save)
+            logging.info("Data saved successfully")
+            return True
         
-        if os.path.exists(excel_file):
-            if not os.access(excel_file, os.W_OK):
-                raise PermissionError(f"No write permission for {excel_file}")
+        if os.path.exists(storage_target):
+            if not os.access(storage_target, os.W_OK):
+                raise PermissionError(f"No write permission for {storage_target}")
         else:
-            directory = os.path.dirname(excel_file) or '.'
+            directory = os.path.dirname(storage_target) or '.'
             if not os.access(directory, os.W_OK):
                 raise PermissionError(f"No write permission for directory {directory}")
         
-        df_to_save.to_excel(excel_file, index=False, engine='openpyxl')
+        df_to_save.to_excel(storage_target, index=False, engine='openpyxl')
         logging.info("Data saved successfully")
         return True
     except Exception as e:
@@ -180,7 +561,429 @@ def save_data(df, excel_file):
         logging.error(f"Data save failed: {str(e)}")
         return False
 
-def save_link(df, url, title, description, tags):
+def _tokenize(text):
+    """Lowercase word tokens used by the search indexes"""
+    return re.findall(r"[a-z0-9]{2,}", str(text).lower())
+
+class RelatedLinksIndex:
+    """Incremental sparse TF-IDF index over link title, description and tags"""
+
+    def __init__(self):
+        self.vocab = {}
+        self.doc_freq = np.zeros(1024, dtype=np.int64)
+        self.rows = {}
+        self.urls = []
+        self._row_terms = []
+        self._pending = []
+        self._matrix = sparse.csr_matrix((0, 0), dtype=np.float64)
+        self._cache = None
+
+    def __len__(self):
+        return len(self.rows)
+
+    @classmethod
+    def from_df(cls, df):
+        """Build an index from a links DataFrame"""
+        index = cls()
+        index.add_many(zip(df['url'], df['title'], df['description'], df['tags']))
+        return index
+
+    def add(self, url, title, description, tags):
+        """Index a link, replacing any previous version of the same URL"""
+        self.add_many([(url, title, description, tags)])
+
+    def add_many(self, links):
+        """Index (url, title, description, tags) tuples in one block"""
+        latest = {}
+        for url, title, description, tags in links:
+            latest[url] = (title, description, tags)
+        vocab = self.vocab
+        indices, counts, indptr, urls = [], [], [0], []
+        for url, (title, description, tags) in latest.items():
+            if url in self.rows:
+                self.remove(url)
+            tags = tags if isinstance(tags, list) else []
+            terms = Counter(_tokenize(title) + _tokenize(description) +
+                            [f"#{str(tag).strip().lower()}" for tag in tags if str(tag).strip()])
+            for term, n in terms.items():
+                term_id = vocab.get(term)
+                if term_id is None:
+                    term_id = vocab[term] = len(vocab)
+                indices.append(term_id)
+                counts.append(n)
+            indptr.append(len(indices))
+            urls.append(url)
+        if not urls:
+            return
+
+        n_terms = len(vocab)
+        if n_terms > len(self.doc_freq):
+            self.doc_freq = np.concatenate([self.doc_freq, np.zeros(max(n_terms, len(self.doc_freq)), dtype=np.int64)])
+        indices = np.array(indices, dtype=np.int64)
+        indptr = np.array(indptr, dtype=np.int64)
+        self.doc_freq[:n_terms] += np.bincount(indices, minlength=n_terms)
+
+        start = len(self.urls)
+        self.rows.update((url, start + offset) for offset, url in enumerate(urls))
+        self.urls.extend(urls)
+        self._row_terms.extend(np.split(indices, indptr[1:-1]))
+        self._pending.append((indices, 1.0 + np.log(np.array(counts, dtype=np.float64)), indptr))
+        self._cache = None
+
+    def sync(self, df):
+        """Add and remove only the URLs that differ from a links DataFrame"""
+        current = set(df['url'])
+        for url in [url for url in self.rows if url not in current]:
+            self.remove(url)
+        missing = df[~df['url'].isin(list(self.rows))]
+        self.add_many(zip(missing['url'], missing['title'], missing['description'], missing['tags']))
+
+    def memory_bytes(self):
+        """Approximate memory held by the index"""
+        matrix = self._matrix.data.nbytes + self._matrix.indices.nbytes + self._matrix.indptr.nbytes
+        pending = sum(i.nbytes + d.nbytes + p.nbytes for i, d, p in self._pending)
+        return int(matrix + pending + self.doc_freq.nbytes + 80 * len(self.vocab) + 160 * len(self.urls))
+
+    def remove(self, url):
+        """Drop a link from the index"""
+        row = self.rows.pop(url, None)
+        if row is None:
+            return
+        self.doc_freq[self._row_terms[row]] -= 1
+        self._row_terms[row] = np.zeros(0, dtype=np.int64)
+        self.urls[row] = None
+        self._cache = None
+        if len(self.urls) > 1000 and len(self.rows) < len(self.urls) // 2:
+            self._compact()
+
+    def _flush(self):
+        """Append pending rows to the sparse matrix"""
+        n_terms = len(self.vocab)
+        if self._matrix.shape[1] != n_terms:
+            self._matrix.resize((self._matrix.shape[0], n_terms))
+        if self._pending:
+            offsets = np.cumsum([0] + [len(indices) for indices, _, _ in self._pending[:-1]])
+            indptr = np.concatenate([[0]] + [block_indptr[1:] + offset
+                                             for (_, _, block_indptr), offset in zip(self._pending, offsets)])
+            indices = np.concatenate([indices for indices, _, _ in self._pending])
+            data = np.concatenate([data for _, data, _ in self._pending])
+            block = sparse.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, n_terms))
+            self._matrix = sparse.vstack([self._matrix, block], format='csr')
+            self._pending = []
+
+    def _compact(self):
+        """Rebuild the matrix without removed rows"""
+        self._flush()
+        alive = [row for row, url in enumerate(self.urls) if url is not None]
+        self._matrix = self._matrix[alive]
+        self.urls = [self.urls[row] for row in alive]
+        self._row_terms = [self._row_terms[row] for row in alive]
+        self.rows = {url: row for row, url in enumerate(self.urls)}
+        self._cache = None
+
+    def _weights(self):
+        """Squared IDF weights, document norms and the live-row mask"""
+        if self._cache is None:
+            self._flush()
+            n_terms = len(self.vocab)
+            idf = np.log((1.0 + len(self.rows)) / (1.0 + self.doc_freq[:n_terms])) + 1.0
+            idf_sq = idf ** 2
+            norms = np.sqrt(self._matrix.power(2) @ idf_sq)
+            alive = np.fromiter((url is not None for url in self.urls), dtype=bool, count=len(self.urls))
+            self._cache = (idf_sq, norms, alive)
+        return self._cache
+
+    def related(self, url, k=5):
+        """Top-k links by cosine similarity to the given URL"""
+        row = self.rows.get(url)
+        if row is None:
+            return []
+        idf_sq, norms, alive = self._weights()
+        if norms[row] == 0:
+            return []
+        query = self._matrix.getrow(row)
+        weights = np.zeros(self._matrix.shape[1])
+        weights[query.indices] = query.data * idf_sq[query.indices]
+        scores = self._matrix @ weights
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = scores / (norms * norms[row])
+        scores[~alive | (norms == 0)] = -np.inf
+        scores[row] = -np.inf
+
+        k = min(k, len(scores) - 1)
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.urls[i], float(scores[i])) for i in top if scores[i] > 0]
+
+def _domain(url):
+    """Host part of a URL without the www. prefix"""
+    try:
+        host = urlparse(str(url)).netloc.lower()
+    except ValueError:
+        return ""
+    return host[4:] if host.startswith("www.") else host
+
+class TagSuggester:
+    """Incremental tag co-occurrence, domain and title-word statistics for tag suggestions"""
+
+    top_k = 8
+    top_cache_size = 2048
+
+    def __init__(self):
+        self.tag_counts = Counter()
+        self.cooccurrence = {}
+        self.domain_tags = {}
+        self.token_tags = {}
+        self.lowercase_tags = {}
+        self.links = {}
+        self._top = OrderedDict()
+
+    def __len__(self):
+        return len(self.links)
+
+    @classmethod
+    def from_df(cls, df):
+        """Build statistics from a links DataFrame in bulk"""
+        suggester = cls()
+        # Same host rule as _domain, vectorized (urlparse per row dominates large builds)
+        domains = (df['url'].astype(str).str.extract(r"^[A-Za-z][A-Za-z0-9+.\-]*://([^/?#]*)", expand=False)
+                   .fillna("").str.lower().str.replace(r"^www\.", "", regex=True))
+        records = []
+        for url, domain, title, tags in zip(df['url'], domains, df['title'], df['tags']):
+            tags = tags if isinstance(tags, list) else []
+            record = (domain, set(_tokenize(title)), sorted({str(tag).strip() for tag in tags if str(tag).strip()}))
+            suggester.links[url] = record
+            records.append(record)
+        if not records:
+            return suggester
+
+        # Count (key, tag) pairs with pandas instead of one Counter update per link
+        links = pd.DataFrame(records, columns=['domain', 'tokens', 'tags'])
+        tag_rows = links['tags'].explode().dropna().rename('tag')
+        suggester.tag_counts.update(dict(zip(*np.unique(tag_rows.to_numpy(dtype=str), return_counts=True))))
+        for table, keys in [(suggester.domain_tags, links['domain']),
+                            (suggester.token_tags, links['tokens'].explode().dropna()),
+                            (suggester.cooccurrence, tag_rows)]:
+            pairs = keys.rename('key').to_frame().join(tag_rows, how='inner')
+            pairs = pairs[pairs['key'] != pairs['tag']] if table is suggester.cooccurrence else pairs
+            counts = pairs.value_counts()
+            for (key, tag), n in zip(counts.index, counts.tolist()):
+                table.setdefault(key, Counter())[tag] = n
+        suggester.lowercase_tags = {tag.lower(): tag for tag in suggester.tag_counts}
+        return suggester
+
+    def sync(self, df):
+        """Add and remove only the URLs that differ from a links DataFrame"""
+        current = set(df['url'])
+        for url in [url for url in self.links if url not in current]:
+            self.remove(url)
+        missing = df[~df['url'].isin(list(self.links))]
+        for url, title, description, tags in zip(missing['url'], missing['title'],
+                                                 missing['description'], missing['tags']):
+            self.add(url, title, description, tags)
+
+    def memory_bytes(self):
+        """Approximate memory held by the statistics"""
+        entries = sum(len(counter) for table in (self.domain_tags, self.token_tags, self.cooccurrence)
+                      for counter in table.values())
+        return int(100 * entries + 200 * len(self.links) + 100 * len(self.tag_counts) +
+                   (150 + 60 * self.top_k) * len(self._top))
+
+    def _bump(self, table, key, tag, sign):
+        """Adjust one nested counter, dropping entries that reach zero"""
+        counters = getattr(self, table)
+        counts = counters.setdefault(key, Counter())
+        counts[tag] += sign
+        if counts[tag] <= 0:
+            del counts[tag]
+            if not counts:
+                del counters[key]
+        self._top.pop((table, key), None)
+
+    def _top_tags(self, table, key):
+        """Cached (total, top tags) for one key, so suggest never ranks a whole Counter"""
+        cached = self._top.get((table, key))
+        if cached is not None:
+            self._top.move_to_end((table, key))
+            return cached
+        counts = self.tag_counts if table == 'tag_counts' else getattr(self, table).get(key)
+        if not counts:
+            return (0, [])  # Unknown keys (typed words, new domains) are not cached
+        cached = self._top[(table, key)] = (sum(counts.values()), counts.most_common(self.top_k))
+        if len(self._top) > self.top_cache_size:
+            self._top.popitem(last=False)
+        return cached
+
+    def _update(self, domain, tokens, tags, sign):
+        if tags:
+            self._top.pop(('tag_counts', None), None)
+        for tag in tags:
+            self.tag_counts[tag] += sign
+            if self.tag_counts[tag] > 0:
+                self.lowercase_tags[tag.lower()] = tag
+            else:
+                del self.tag_counts[tag]
+                self.lowercase_tags.pop(tag.lower(), None)
+            self._bump('domain_tags', domain, tag, sign)
+            for token in tokens:
+                self._bump('token_tags', token, tag, sign)
+            for other in tags:
+                if other != tag:
+                    self._bump('cooccurrence', tag, other, sign)
+
+    def add(self, url, title, description, tags):
+        """Record a link's tags, replacing any previous version of the same URL"""
+        self.remove(url)
+        tags = tags if isinstance(tags, list) else []
+        tags = sorted({str(tag).strip() for tag in tags if str(tag).strip()})
+        record = (_domain(url), set(_tokenize(title)), tags)
+        self.links[url] = record
+        self._update(*record, 1)
+
+    def remove(self, url):
+        """Forget a link's tags"""
+        record = self.links.pop(url, None)
+        if record:
+            self._update(*record, -1)
+
+    def suggest(self, url, title="", seed_tags=(), k=8):
+        """Ranked tag suggestions for a URL and title"""
+        scores = Counter()
+        if url:
+            total, top = self._top_tags('domain_tags', _domain(url))
+            for tag, n in top[:k]:
+                scores[tag] += 3.0 * n / total
+
+        tokens = set(_tokenize(title))
+        seeds = {str(tag).strip() for tag in seed_tags if str(tag).strip()}
+        seeds |= {self.lowercase_tags[token] for token in tokens if token in self.lowercase_tags}
+        for token in tokens:
+            for tag, n in self._top_tags('token_tags', token)[1][:3]:
+                scores[tag] += n / max(self.tag_counts[tag], 1)
+
+        for seed in seeds:
+            scores[seed] += 1.0
+            seed_total = max(self.tag_counts.get(seed, 0), 1)
+            for tag, n in self._top_tags('cooccurrence', seed)[1][:k]:
+                scores[tag] += n / seed_total
+
+        ranked = [tag for tag, _ in scores.most_common(k)]
+        for tag in [t for t, _ in self._top_tags('tag_counts', None)[1][:k]] + DEFAULT_TAGS:
+            if len(ranked) >= k:
+                break
+            if tag not in ranked:
+                ranked.append(tag)
+        return ranked
+
+LINK_INDEX_TYPES = {'related': RelatedLinksIndex, 'tags': TagSuggester}
+
+def dataset_version(source):
+    """Counter bumped whenever the session's stored links DataFrame is replaced"""
+    if source == "public":
+        registry = _public_registry()
+        with registry['lock']:
+            entry = registry['sessions'].get(_public_session_id())
+            return entry.get('version', 0) if entry is not None else 0
+    return st.session_state.get('df_version', 0)
+
+def set_session_df(df):
+    """Store the owner/guest session's links DataFrame and bump its dataset version"""
+    st.session_state['df'] = df
+    st.session_state['df_version'] = st.session_state.get('df_version', 0) + 1
+
+def _link_index_holder(source):
+    """The dataset's indexes with the dataset version they reflect.
+
+    Public indexes live in the session's registry entry so they are counted against the
+    public memory limits and freed on eviction; owner/guest indexes live in session state.
+    """
+    if source == "public":
+        registry = _public_registry()
+        with registry['lock']:
+            entry = registry['sessions'].get(_public_session_id())
+            if entry is None:
+                return {'source': source, 'version': None, 'indexes': {}}
+            return entry.setdefault('link_indexes', {'source': source, 'version': None, 'indexes': {}})
+    holder = st.session_state.get('link_indexes')
+    if holder is None or holder['source'] != source:
+        holder = {'source': source, 'version': None, 'indexes': {}}
+        st.session_state['link_indexes'] = holder
+    return holder
+
+def get_link_indexes(source):
+    """Built indexes a save path may update in place, or None if they lag the dataset"""
+    holder = _link_index_holder(source)
+    return holder['indexes'] if holder['version'] == dataset_version(source) else None
+
+def finish_link_edit(source, indexes, saved):
+    """Record whether the save that updated indexes in place was stored, rebuilding them if not"""
+    if indexes is None:
+        return
+    holder = _link_index_holder(source)
+    if saved:
+        holder['version'] = dataset_version(source)
+    else:
+        holder['indexes'].clear()
+        holder['version'] = None
+
+def get_link_index(working_df, source, kind):
+    """Return one link index, building it on first use and syncing it after outside changes"""
+    holder = _link_index_holder(source)
+    indexes = holder['indexes']
+    version = dataset_version(source)
+    changed = False
+    if holder['version'] != version:
+        for name, index in indexes.items():
+            logging.debug(f"Syncing {name} index for {source}")
+            index.sync(working_df)
+        holder['version'] = version
+        changed = bool(indexes)
+    index = indexes.get(kind)
+    if index is None:
+        logging.debug(f"Building {kind} index for {source} ({len(working_df)} links)")
+        index = indexes[kind] = LINK_INDEX_TYPES[kind].from_df(working_df)
+        changed = True
+    if changed and source == "public":
+        _update_public_index_bytes()
+    return index
+
+def apply_link_edit(mode, storage_target, edit):
+    """Apply edit(df, indexes) -> (df, result) to the session's links and store the result.
+
+    Owner/guest edits run under storage_lock and start from a fresh load when another writer
+    (the API/CLI or another session) saved since this session last loaded, so their links
+    survive. A result of None means the edit failed and nothing is saved.
+    Returns (saved, df, result).
+    """
+    if mode == "public":
+        indexes = get_link_indexes("public")
+        df, result = edit(get_public_df(), indexes)
+        saved = result is not None and set_public_df(df)
+        finish_link_edit("public", indexes, saved)
+        return saved, df, result
+
+    with storage_lock(storage_target):
+        version = storage_version(storage_target)
+        if version != st.session_state.get('storage_version'):
+            logging.info(f"{storage_target} changed since it was loaded; reloading before saving")
+            df, _ = init_data(mode, st.session_state.get('username'))
+            if 'url' not in df.columns:
+                return False, st.session_state['df'], None
+            set_session_df(df)
+            st.session_state['storage_version'] = version
+        indexes = get_link_indexes(storage_target)
+        # Edit a copy so a failed save leaves the session's stored frame untouched
+        df, result = edit(st.session_state['df'].copy(), indexes)
+        saved = result is not None and save_data(df, storage_target)
+        if saved:
+            set_session_df(df)
+            st.session_state['storage_version'] = storage_version(storage_target)
+        finish_link_edit(storage_target, indexes, saved)
+    return saved, df, result
+
+def save_link(df, url, title, description, tags, indexes=None):
     """Save or update a link in the DataFrame"""
     try:
         logging.debug(f"Saving link: URL={url}, Title={title}, Description={description}, Tags={tags}")
@@ -209,6 +1012,9 @@ def save_link(df, url, title, description, tags):
             df = pd.concat([df, pd.DataFrame([new_entry])], ignore_index=True)
             action = "saved"
         
+        for index in (indexes or {}).values():
+            index.add(url, title, description, [str(tag).strip() for tag in tags if str(tag).strip()])
+        
         logging.info(f"Link {action} successfully")
         return df, action
     except Exception as e:
@@ -216,27 +1022,95 @@ def save_link(df, url, title, description, tags):
         logging.error(f"Link save failed: {str(e)}")
         return df, None
 
-def delete_selected_links(df, excel_file, selected_urls, mode):
+def save_links(df, links, indexes=None):
+    """Save or update a batch of links with a single concat"""
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    positions = {}
+    for idx, url in zip(df.index, df['url']):
+        positions.setdefault(url, idx)
+    next_id = df['id'].max() + 1 if not df.empty else 1
+    new_rows = {}
+    actions = []
+    
+    for link in links:
+        url, title = link['url'], link['title']
+        description = link.get('description') or ""
+        tags = [str(tag).strip() for tag in link.get('tags', []) if str(tag).strip()]
+        if url in positions:
+            idx = positions[url]
+            df.at[idx, 'title'] = title
+            df.at[idx, 'description'] = description
+            df.at[idx, 'tags'] = tags
+            df.at[idx, 'updated_at'] = now
+            actions.append("updated")
+        elif url in new_rows:
+            new_rows[url].update(title=title, description=description, tags=tags, updated_at=now)
+            actions.append("updated")
+        else:
+            new_rows[url] = {
+                'id': next_id,
+                'url': url,
+                'title': title,
+                'description': description,
+                'tags': tags,
+                'created_at': now,
+                'updated_at': now
+            }
+            next_id += 1
+            actions.append("saved")
+        for index in (indexes or {}).values():
+            index.add(url, title, description, tags)
+    
+    if new_rows:
+        df = pd.concat([df, pd.DataFrame(list(new_rows.values()))], ignore_index=True)
+    logging.info(f"Batch saved {actions.count('saved')} and updated {actions.count('updated')} link(s)")
+    return df, actions
+
+def remove_links(df, urls, indexes=None):
+    """Return the DataFrame without the given URLs"""
+    df = df[~df['url'].isin(urls)]
+    for index in (indexes or {}).values():
+        for url in urls:
+            index.remove(url)
+    return df
+
+def search_links(df, search_query):
+    """Rows whose title, URL, description or tags contain the query (case-insensitive)"""
+    search_lower = search_query.lower()
+    mask = (
+        df['title'].str.lower().str.contains(search_lower, na=False, regex=False) |
+        df['url'].str.lower().str.contains(search_lower, na=False, regex=False) |
+        df['description'].str.lower().str.contains(search_lower, na=False, regex=False) |
+        df['tags'].apply(
+            lambda x: any(search_lower in str(tag).lower() for tag in (x if isinstance(x, list) else []))
+        )
+    )
+    return df[mask]
+
+def filter_links_by_tags(df, selected_tags):
+    """Rows carrying any of the selected tags"""
+    mask = df['tags'].apply(
+        lambda x: any(str(tag) in map(str, (x if isinstance(x, list) else [])) 
+                      for tag in selected_tags)
+    )
+    return df[mask]
+
+def delete_selected_links(df, storage_target, selected_urls, mode):
     """Delete selected links from the DataFrame"""
     try:
         logging.debug(f"Deleting URLs: {selected_urls}")
         if not selected_urls:
             st.warning("No links selected for deletion")
             return df
-        df = df[~df['url'].isin(selected_urls)]
-        if mode in ["owner", "guest"]:
-            if save_data(df, excel_file):
-                st.session_state['df'] = df
-                st.success(f"✅ {len(selected_urls)} link(s) deleted successfully!")
-                st.balloons()
-                time.sleep(0.5)
-            else:
-                st.error("Failed to save changes after deletion")
-        else:
-            st.session_state['user_df'] = df
+        saved, df, _ = apply_link_edit(
+            mode, storage_target, lambda links, indexes: (remove_links(links, selected_urls, indexes), True)
+        )
+        if saved:
             st.success(f"✅ {len(selected_urls)} link(s) deleted successfully!")
             st.balloons()
             time.sleep(0.5)
+        elif mode in ["owner", "guest"]:
+            st.error("Failed to save changes after deletion")
         return df
     except Exception as e:
         st.error(f"Error deleting links: {str(e)}")
@@ -266,8 +1140,8 @@ def display_header(mode, username=None):
     </div>
     """, unsafe_allow_html=True)
 
-def fetch_metadata(url):
-    """Get page metadata with error handling"""
+def _fetch_metadata_result(url):
+    """Get page metadata, returning any error message instead of displaying it"""
     try:
         headers = {'User-Agent': 'Mozilla/5.0'}
         response = requests.get(url, headers=headers, timeout=10)
@@ -280,29 +1154,70 @@ def fetch_metadata(url):
         keywords = soup.find('meta', attrs={'name': 'keywords'})
         keywords = keywords['content'].split(',')[:5] if keywords else []
         
-        return title, description, [k.strip() for k in keywords if k.strip()]
+        return title, description, [k.strip() for k in keywords if k.strip()], None
     except Exception as e:
-        st.warning(f"Couldn't fetch metadata: {str(e)}")
-        return url, "", []
+        return url, "", [], str(e)
+
+def fetch_metadata(url):
+    """Get page metadata with error handling"""
+    title, description, keywords, error = _fetch_metadata_result(url)
+    if error:
+        st.warning(f"Couldn't fetch metadata: {error}")
+    return title, description, keywords
+
+@st.cache_resource
+def _metadata_prefetcher():
+    """Shared executor and in-flight/completed fetch map for all sessions"""
+    return {
+        'executor': ThreadPoolExecutor(max_workers=METADATA_WORKERS, thread_name_prefix="wcm-metadata"),
+        'lock': threading.Lock(),
+        'futures': OrderedDict()
+    }
+
+def _metadata_failed(future):
+    """Whether a finished fetch produced an error rather than metadata"""
+    return future.exception() is not None or bool(future.result()[3])
+
+def prefetch_metadata(url, refresh=False):
+    """Start a background metadata fetch for url, or join the one in flight or still fresh.
+
+    Successful results are reused for METADATA_TTL_SECONDS; a failed result is handed out
+    once and then forgotten, so the next request for that URL fetches again.
+    """
+    prefetcher = _metadata_prefetcher()
+    with prefetcher['lock']:
+        futures = prefetcher['futures']
+        entry = futures.get(url)
+        if entry is not None and entry['future'].done() and (
+                refresh or time.time() - entry['submitted_at'] > METADATA_TTL_SECONDS):
+            entry = None
+        if entry is None:
+            logging.debug(f"Prefetching metadata for {url}")
+            entry = {'future': prefetcher['executor'].submit(_fetch_metadata_result, url),
+                     'submitted_at': time.time()}
+            futures[url] = entry
+        future = entry['future']
+        if future.done() and _metadata_failed(future):
+            del futures[url]
+        else:
+            futures.move_to_end(url)
+        while len(futures) > METADATA_CACHE_SIZE and next(iter(futures.values()))['future'].done():
+            futures.popitem(last=False)
+    return future
 
-def add_link_section(df, excel_file, mode):
+def add_link_section(df, storage_target, mode):
     """Section for adding new links with working Fetch button"""
     st.markdown("### 🌐 Add New Web Content")
     
-    # Initialize user DataFrame for public mode
-    if mode == "public" and 'user_df' not in st.session_state:
-        st.session_state['user_df'] = pd.DataFrame(columns=[
-            'id', 'url', 'title', 'description', 'tags', 
-            'created_at', 'updated_at'
-        ])
-    
     # Determine the DataFrame to use
-    working_df = st.session_state['user_df'] if mode == "public" else df
+    working_df = get_public_df() if mode == "public" else df
     
     # Dynamic key for url_input to force reset
     if 'url_input_counter' not in st.session_state:
         st.session_state['url_input_counter'] = 0
     url_input_key = f"url_input_{st.session_state['url_input_counter']}"
+    title_key = f"title_input_{st.session_state['url_input_counter']}"
+    description_key = f"description_input_{st.session_state['url_input_counter']}"
     
     # Clear URL field if signaled
     url_value = '' if st.session_state.get('clear_url', False) else st.session_state.get(url_input_key, '')
@@ -318,13 +1233,61 @@ def add_link_section(df, excel_file, mode):
     
     is_url_valid = url_temp.startswith(("http://", "https://")) if url_temp else False
     
+    # Start fetching metadata in the background as soon as a valid URL is entered
+    metadata_future = None
+    if is_url_valid and st.session_state.get('metadata_applied_url') != url_temp:
+        metadata_future = prefetch_metadata(url_temp)
+    
     if st.button("Fetch Metadata", disabled=not is_url_valid, key="fetch_metadata"):
-        with st.spinner("Fetching..."):
-            title, description, keywords = fetch_metadata(url_temp)
-            st.session_state['auto_title'] = title
-            st.session_state['auto_description'] = description
-            st.session_state['suggested_tags'] = keywords
-            st.session_state['clear_url'] = False
+        metadata_future = prefetch_metadata(url_temp, refresh=True)
+        st.session_state['metadata_applied_url'] = None
+        st.session_state['metadata_overwrite'] = True
+        st.session_state['clear_url'] = False
+    
+    # Fill the fields once the fetch for this URL has finished. Fields the user already edited
+    # keep their text unless Fetch Metadata was pressed explicitly.
+    if (metadata_future is not None and metadata_future.done()
+            and st.session_state.get('metadata_applied_url') != url_temp):
+        title, description, keywords, error = metadata_future.result()
+        if error:
+            st.warning(f"Couldn't fetch metadata: {error}")
+        overwrite = st.session_state.pop('metadata_overwrite', False)
+        for key, auto_key, value in [(title_key, 'auto_title', title),
+                                     (description_key, 'auto_description', description)]:
+            if overwrite or st.session_state.get(key, '') in ('', st.session_state.get(auto_key, '')):
+                st.session_state[key] = value
+            st.session_state[auto_key] = value
+        st.session_state['suggested_tags'] = keywords
+        st.session_state['metadata_applied_url'] = url_temp
+        st.session_state['clear_url'] = False
+    
+    # Title and description sit outside the form so edits are known to the fill step above,
+    # and title edits rerun the page to refine the tag suggestions
+    title = st.text_input(
+        "Title*", 
+        help="Give your link a descriptive title",
+        key=title_key
+    )
+    
+    description = st.text_area(
+        "Description", 
+        height=100,
+        help="Add notes about why this link is important",
+        key=description_key
+    )
+    
+    # Rank tag suggestions once a URL is entered; the statistics are only built then
+    ranked_tags = []
+    if is_url_valid:
+        tag_suggester = get_link_index(working_df, storage_target or "public", 'tags')
+        ranked_tags = tag_suggester.suggest(url_temp, title,
+                                            seed_tags=st.session_state.get('suggested_tags', []))
+        library_tags = set(tag_suggester.tag_counts)
+        if ranked_tags:
+            st.caption(f"💡 Suggested tags: {', '.join(ranked_tags)}")
+    else:
+        library_tags = {str(tag).strip() for tags in working_df['tags'] if isinstance(tags, list)
+                        for tag in tags if str(tag).strip()}
     
     # Form for saving link
     with st.form("add_link_form", clear_on_submit=True):
@@ -335,28 +1298,11 @@ def add_link_section(df, excel_file, mode):
             help="Confirm the URL to save"
         )
         
-        title = st.text_input(
-            "Title*", 
-            value=st.session_state.get('auto_title', ''),
-            help="Give your link a descriptive title",
-            key="title_input"
-        )
-        
-        description = st.text_area(
-            "Description", 
-            value=st.session_state.get('auto_description', ''),
-            height=100,
-            help="Add notes about why this link is important",
-            key="description_input"
-        )
-        
-        # Get all unique tags from DataFrame
-        all_tags = sorted({str(tag).strip() for sublist in working_df['tags'] 
-                         for tag in (sublist if isinstance(sublist, list) else []) 
-                         if str(tag).strip()})
-        suggested_tags = st.session_state.get('suggested_tags', []) + \
-                       ['research', 'tutorial', 'news', 'tool', 'inspiration']
-        all_tags = sorted(list(set(all_tags + [str(tag).strip() for tag in suggested_tags if str(tag).strip()])))
+        # Suggested tags first, then the rest of the library's tags
+        suggested_tags = [str(tag).strip() for tag in ranked_tags + st.session_state.get('suggested_tags', [])
+                          if str(tag).strip()]
+        suggested_tags = list(dict.fromkeys(suggested_tags))
+        all_tags = suggested_tags + sorted(library_tags - set(suggested_tags))
         
         selected_tags = st.multiselect(
             "Tags",
@@ -384,43 +1330,44 @@ def add_link_section(df, excel_file, mode):
             elif not title:
                 st.error("Please enter a title")
             else:
-                working_df, action = save_link(working_df, url, title, description, tags)
+                saved, working_df, action = apply_link_edit(
+                    mode, storage_target,
+                    lambda links, indexes: save_link(links, url, title, description, tags, indexes)
+                )
                 if action:
                     logging.debug(f"Displaying success message and balloons for action: {action}")
-                    if mode in ["owner", "guest"]:
-                        if save_data(working_df, excel_file):
-                            st.session_state['df'] = working_df
-                            st.success(f"✅ Link {action} successfully!")
-                            st.balloons()
-                            time.sleep(0.5)
-                            st.session_state['clear_url'] = True
-                            st.session_state['url_input_counter'] += 1
-                            for key in ['auto_title', 'auto_description', 'suggested_tags']:
-                                st.session_state.pop(key, None)
-                            st.rerun()
-                        else:
-                            st.error("Failed to save link to Excel file")
-                    else:
-                        st.session_state['user_df'] = working_df
-                        st.success(f"✅ Link {action} successfully! Download your links as they are temporary.")
+                    if saved:
+                        temporary = " Download your links as they are temporary." if mode == "public" else ""
+                        st.success(f"✅ Link {action} successfully!{temporary}")
                         st.balloons()
                         time.sleep(0.5)
                         st.session_state['clear_url'] = True
                         st.session_state['url_input_counter'] += 1
-                        for key in ['auto_title', 'auto_description', 'suggested_tags']:
+                        for key in ['auto_title', 'auto_description', 'suggested_tags', 'metadata_applied_url',
+                                    'metadata_overwrite']:
                             st.session_state.pop(key, None)
                         st.rerun()
+                    elif mode in ["owner", "guest"]:
+                        st.error("Failed to save link")
                 else:
                     st.error("Failed to process link")
     
+    # The page is already rendered; re-check a pending fetch every METADATA_POLL_SECONDS and
+    # rerun so the fields fill in as soon as it lands. Each check ends the script run, so user
+    # input waits at most one poll interval.
+    if metadata_future is not None and not metadata_future.done():
+        st.caption("⏳ Fetching page metadata in the background...")
+        wait([metadata_future], timeout=METADATA_POLL_SECONDS)
+        st.rerun()
+    
     return working_df
 
-def browse_section(df, excel_file, mode):
+def browse_section(df, storage_target, mode):
     """Section for browsing saved links"""
     st.markdown("### 📚 Browse Saved Links")
     
-    # Use user_df for public mode
-    working_df = st.session_state['user_df'] if mode == "public" else df
+    # Use the session's public dataset for public mode
+    working_df = get_public_df() if mode == "public" else df
     
     if working_df.empty:
         st.info("✨ No links saved yet. Add your first link to get started!")
@@ -452,17 +1399,8 @@ def browse_section(df, excel_file, mode):
     
     if search_query or submitted:
         logging.debug(f"Applying search query: {search_query}")
-        search_lower = search_query.lower()
         try:
-            mask = (
-                filtered_df['title'].str.lower().str.contains(search_lower, na=False) |
-                filtered_df['url'].str.lower().str.contains(search_lower, na=False) |
-                filtered_df['description'].str.lower().str.contains(search_lower, na=False) |
-                filtered_df['tags'].apply(
-                    lambda x: any(search_lower in str(tag).lower() for tag in (x if isinstance(x, list) else []))
-                )
-            )
-            filtered_df = filtered_df[mask]
+            filtered_df = search_links(filtered_df, search_query)
             logging.debug(f"Search results: {len(filtered_df)} links found")
         except Exception as e:
             st.error(f"Search error: {str(e)}")
@@ -471,11 +1409,7 @@ def browse_section(df, excel_file, mode):
     if selected_tags:
         logging.debug(f"Applying tag filter: {selected_tags}")
         try:
-            mask = filtered_df['tags'].apply(
-                lambda x: any(str(tag) in map(str, (x if isinstance(x, list) else [])) 
-                              for tag in selected_tags)
-            )
-            filtered_df = filtered_df[mask]
+            filtered_df = filter_links_by_tags(filtered_df, selected_tags)
             logging.debug(f"Tag filter results: {len(filtered_df)} links found")
         except Exception as e:
             st.error(f"Tag filter error: {str(e)}")
@@ -494,9 +1428,7 @@ def browse_section(df, excel_file, mode):
         display_df['tags'] = display_df['tags'].apply(
             lambda x: ', '.join(str(tag) for tag in (x if isinstance(x, list) else [])))
         
-        display_df['Select'] = [False] * len(display_df)
-        for i, row in display_df.iterrows():
-            display_df.at[i, 'Select'] = row['url'] in st.session_state.selected_urls
+        display_df['Select'] = display_df['url'].isin(st.session_state.selected_urls).astype(bool)
         
         edited_df = st.data_editor(
             display_df[['Select', 'title', 'url', 'description', 'tags', 'created_at']],
@@ -518,13 +1450,32 @@ def browse_section(df, excel_file, mode):
         
         if st.session_state.selected_urls:
             if st.button("🗑️ Delete Selected Links", key="delete_selected"):
-                working_df = delete_selected_links(working_df, excel_file, st.session_state.selected_urls, mode)
-                if mode == "public":
-                    st.session_state['user_df'] = working_df
-                else:
-                    st.session_state['df'] = working_df
+                delete_selected_links(working_df, storage_target, st.session_state.selected_urls, mode)
                 st.session_state.selected_urls = []
                 st.rerun()
+    
+    if not filtered_df.empty:
+        with st.expander("🔗 Related Links", expanded=False):
+            titles = dict(zip(filtered_df['url'], filtered_df['title']))
+            source_url = st.selectbox(
+                "Find links related to",
+                options=list(titles),
+                format_func=lambda u: titles.get(u) or u,
+                index=None,
+                placeholder="Choose a saved link",
+                key="related_source",
+                help="Pick a saved link to see similar ones from your library"
+            )
+            # Expander bodies run even when collapsed; only build the index once a link is picked
+            if source_url:
+                related = get_link_index(working_df, storage_target or "public", 'related').related(source_url, k=5)
+                if related:
+                    all_titles = dict(zip(working_df['url'], working_df['title']))
+                    for url, score in related:
+                        label = str(all_titles.get(url) or url).replace('[', '(').replace(']', ')')
+                        st.markdown(f"- [{label}]({url}) <small>({score:.0%} match)</small>", unsafe_allow_html=True)
+                else:
+                    st.info("No related links found")
 
 def format_tags(tags):
     """Format tags as pretty pills"""
@@ -545,12 +1496,12 @@ def format_tags(tags):
             """)
     return "".join(html_tags)
 
-def download_section(df, excel_file, mode):
+def download_section(df, storage_target, mode):
     """Section for downloading data (XLS only)"""
     st.markdown("### 📥 Export Your Links")
     
-    # Use user_df for public mode
-    working_df = st.session_state['user_df'] if mode == "public" else df
+    # Use the session's public dataset for public mode
+    working_df = get_public_df() if mode == "public" else df
     
     if working_df.empty:
         st.warning("No links available to export")
@@ -564,8 +1515,8 @@ def download_section(df, excel_file, mode):
         </div>
         """, unsafe_allow_html=True)
         
-        if mode in ["owner", "guest"] and excel_file:
-            with open(excel_file, 'rb') as f:
+        if mode == "owner" and storage_target:
+            with open(storage_target, 'rb') as f:
                 st.download_button(
                     label=f"Download {mode.capitalize()} Links (Excel)",
                     data=f,
@@ -573,16 +1524,16 @@ def download_section(df, excel_file, mode):
                     mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                     help=f"Download all {mode} links in Excel format"
                 )
-        elif mode == "public" and not working_df.empty:
+        elif not working_df.empty:
             output = BytesIO()
-            working_df.to_excel(output, index=False, engine='openpyxl')
+            flatten_tags(working_df).to_excel(output, index=False, engine='openpyxl')
             output.seek(0)
             st.download_button(
-                label="Download Public Links (Excel)",
+                label=f"Download {mode.capitalize()} Links (Excel)",
                 data=output,
-                file_name="public_links.xlsx",
+                file_name=f"{mode}_links.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                help="Download all public links in Excel format"
+                help=f"Download all {mode} links in Excel format"
             )
         
         st.markdown(f"""
@@ -712,6 +1663,7 @@ def main():
     
     mode = st.session_state['mode']
     username = st.session_state.get('username')
+    evict_idle_public_sessions()
     
     # Sidebar with Exit button and navigation
     with st.sidebar:
@@ -723,6 +1675,7 @@ def main():
         
         if st.button("🚪 Exit and Clear Cache", key="exit_button", help="Clear all session data and reset the app"):
             logging.debug(f"Exit button clicked. Session state before clear: {st.session_state}")
+            release_public_session()
             for key in list(st.session_state.keys()):
                 del st.session_state[key]
             st.session_state['password_input_counter'] = 0
@@ -732,6 +1685,16 @@ def main():
             time.sleep(0.5)
             st.rerun()
         
+        if mode == "owner":
+            stats = public_memory_stats()
+            st.markdown("**Public Session Memory**")
+            st.progress(min(stats['resident_bytes'] / PUBLIC_TOTAL_MEMORY_BYTES, 1.0))
+            st.caption(
+                f"{_format_bytes(stats['resident_bytes'])} of {_format_bytes(PUBLIC_TOTAL_MEMORY_BYTES)} in memory | "
+                f"{stats['sessions']} session(s), {stats['spilled_sessions']} spilled to disk "
+                f"({_format_bytes(stats['spilled_bytes'])})"
+            )
+        
         st.markdown("""
         <div style="padding: 1rem;">
             <h2 style="margin-bottom: 1.5rem;">Navigation</h2>
@@ -754,20 +1717,17 @@ def main():
     # Initialize data based on mode
     if mode in ["owner", "guest"]:
         if 'df' not in st.session_state or st.session_state.get('username') != username:
-            df, excel_file = init_data(mode, username)
-            st.session_state['df'] = df
-            st.session_state['excel_file'] = excel_file
+            version = storage_version(storage_target_for(mode, username))
+            df, storage_target = init_data(mode, username)
+            set_session_df(df)
+            st.session_state['storage_version'] = version
+            st.session_state['storage_target'] = storage_target
             st.session_state['username'] = username
         else:
             df = st.session_state['df']
-            excel_file = st.session_state['excel_file']
+            storage_target = st.session_state['storage_target']
     else:
-        df, excel_file = pd.DataFrame(), None
-        if 'user_df' not in st.session_state:
-            st.session_state['user_df'] = pd.DataFrame(columns=[
-                'id', 'url', 'title', 'description', 'tags', 
-                'created_at', 'updated_at'
-            ])
+        df, storage_target = pd.DataFrame(), None
     
     # Display header with mode indicator
     display_header(mode, username)
@@ -790,17 +1750,27 @@ def main():
         </div>
         """, unsafe_allow_html=True)
     
+    # Aggregate view over every guest library for the owner
+    if mode == "owner":
+        with st.expander("👥 Guest Libraries", expanded=False):
+            try:
+                stats = cached_guest_stats()
+                guests_col, links_col = st.columns(2)
+                guests_col.metric("Guests", len(stats))
+                links_col.metric("Guest Links", int(stats['links'].sum()) if not stats.empty else 0)
+                if not stats.empty:
+                    st.dataframe(stats, use_container_width=True, hide_index=True)
+            except Exception as e:
+                st.error(f"Failed to load guest statistics: {str(e)}")
+                logging.error(f"Guest stats failed: {str(e)}")
+    
     # Render selected section
     if selected == "Add Link":
-        updated_df = add_link_section(df, excel_file, mode)
-        if mode == "public":
-            st.session_state['user_df'] = updated_df
-        else:
-            st.session_state['df'] = updated_df
+        add_link_section(df, storage_target, mode)
     elif selected == "Browse Links":
-        browse_section(df, excel_file, mode)
+        browse_section(df, storage_target, mode)
     elif selected == "Export Data":
-        download_section(df, excel_file, mode)
+        download_section(df, storage_target, mode)
 
 if __name__ == "__main__":
     main()
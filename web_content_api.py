@@ -0,0 +1,394 @@
+# -*- coding: utf-8 -*-
+"""
+WEB CONTENT MANAGER - Headless HTTP API and CLI over the same link logic as the Streamlit app
+
+    python web_content_api.py serve --port 8502 --max-connections 64
+    python web_content_api.py add https://example.com --title "Example" --tags news,tool
+    python web_content_api.py import links.jsonl
+    python web_content_api.py search python --tags tutorial
+    python web_content_api.py delete https://example.com
+    python web_content_api.py export --output links.xlsx
+    python web_content_api.py guests
+
+Credentials come from --password/--username (or WCM_PASSWORD/WCM_USERNAME for the CLI,
+X-Password/X-Username headers for HTTP) and map to owner or guest storage like the login form.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import urlparse, parse_qs
+
+import web_content_ai_public as app
+
+# The app logs at DEBUG for interactive troubleshooting; too chatty for bulk operations
+logging.getLogger().setLevel(logging.INFO)
+
+STREAM_CHUNK_ROWS = 500
+MAX_BODY_BYTES = 50 * 1024 * 1024
+IDLE_TIMEOUT_SECONDS = 30
+
+class AuthError(Exception):
+    """Raised when credentials do not map to owner or guest storage"""
+
+def resolve_mode(password, username=None):
+    """Map credentials to a storage mode, mirroring login_form"""
+    if password == app.ADMIN_PASSWORD:
+        return "owner", None
+    if password == app.GUEST_PASSWORD:
+        if not username:
+            raise AuthError("Username required for guest mode")
+        return "guest", username
+    raise AuthError("Invalid password")
+
+class LinkStore:
+    """Link DataFrames per owner/guest storage target, each guarded by its own lock.
+
+    Writes hold the cross-process storage_lock (shared with the Streamlit save path) from
+    reload to save, and every access reloads only when another process saved since.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tenants = {}
+
+    def _tenant(self, mode, username):
+        with self._lock:
+            if (mode, username) not in self._tenants:
+                self._tenants[(mode, username)] = {
+                    'lock': threading.Lock(), 'df': None, 'version': None,
+                    'storage_target': app.storage_target_for(mode, username)
+                }
+            return self._tenants[(mode, username)]
+
+    def _refresh(self, tenant, mode, username):
+        """Reload the tenant's links if storage changed since the last load; call with the tenant lock held"""
+        version = app.storage_version(tenant['storage_target'])
+        if tenant['df'] is None or version != tenant['version']:
+            df, _ = app.init_data(mode, username)
+            if 'url' not in df.columns:
+                raise IOError(f"Failed to load {tenant['storage_target']}")
+            tenant['df'], tenant['version'] = df, version
+
+    def _snapshot(self, mode, username):
+        """Tenant's current links"""
+        tenant = self._tenant(mode, username)
+        with tenant['lock']:
+            self._refresh(tenant, mode, username)
+            return tenant
+
+    def _store(self, tenant, df):
+        """Persist df as the tenant's links; call with both locks held"""
+        if not app.save_data(df, tenant['storage_target']):
+            raise IOError(f"Failed to save {tenant['storage_target']}")
+        tenant['df'], tenant['version'] = df, app.storage_version(tenant['storage_target'])
+
+    def add(self, mode, username, links):
+        """Save or update links and persist once; returns per-link actions"""
+        for link in links:
+            if not isinstance(link, dict) or not link.get('url') or not link.get('title'):
+                raise ValueError("Each link needs a url and a title")
+            if isinstance(link.get('tags'), str):
+                link['tags'] = link['tags'].split(',')
+        tenant = self._tenant(mode, username)
+        with tenant['lock'], app.storage_lock(tenant['storage_target']):
+            self._refresh(tenant, mode, username)
+            df, actions = app.save_links(tenant['df'].copy(), links)
+            self._store(tenant, df)
+        return actions
+
+    def delete(self, mode, username, urls):
+        """Delete links by URL and persist; returns the number removed"""
+        tenant = self._tenant(mode, username)
+        with tenant['lock'], app.storage_lock(tenant['storage_target']):
+            self._refresh(tenant, mode, username)
+            before = len(tenant['df'])
+            df = app.remove_links(tenant['df'], urls)
+            if len(df) != before:
+                self._store(tenant, df)
+        return before - len(df)
+
+    def search(self, mode, username, query="", tags=None, limit=None):
+        """Filtered snapshot of the tenant's links"""
+        df = self._snapshot(mode, username)['df']
+        if query:
+            df = app.search_links(df, query)
+        if tags:
+            df = app.filter_links_by_tags(df, tags)
+        return df.head(limit) if limit else df
+
+    def export_excel(self, mode, username):
+        """Tenant's links as Excel bytes"""
+        output = BytesIO()
+        app.flatten_tags(self._snapshot(mode, username)['df']).to_excel(output, index=False, engine='openpyxl')
+        return output.getvalue()
+
+def iter_ndjson(df):
+    """Yield one JSON line per link"""
+    columns = list(df.columns)
+    for values in df.itertuples(index=False, name=None):
+        row = {}
+        for column, value in zip(columns, values):
+            row[column] = value.item() if hasattr(value, 'item') else value
+        yield json.dumps(row, default=str) + "\n"
+
+class LinkAPIServer(ThreadingHTTPServer):
+    """Thread-per-connection HTTP server that turns away connections beyond a limit"""
+
+    daemon_threads = True
+    block_on_close = False
+
+    def __init__(self, server_address, handler_class, store, max_connections=64):
+        super().__init__(server_address, handler_class)
+        self.store = store
+        self.slots = threading.BoundedSemaphore(max_connections)
+
+    def process_request(self, request, client_address):
+        if not self.slots.acquire(blocking=False):
+            try:
+                request.sendall(b"HTTP/1.1 503 Service Unavailable\r\n"
+                                b"Content-Length: 0\r\nConnection: close\r\n\r\n")
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        super().process_request(request, client_address)
+
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self.slots.release()
+
+class LinkAPIHandler(BaseHTTPRequestHandler):
+    """JSON endpoints for link operations"""
+
+    protocol_version = "HTTP/1.1"
+    _body_read = False
+    # Idle keep-alive connections are closed after this, freeing their connection slot
+    timeout = IDLE_TIMEOUT_SECONDS
+
+    def log_message(self, format, *args):
+        logging.debug("%s - %s" % (self.address_string(), format % args))
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_bytes(self, body, content_type, filename):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Disposition", f'attachment; filename="{filename}"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_stream(self, lines):
+        """Stream NDJSON using chunked transfer encoding"""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        batch = []
+        for line in lines:
+            batch.append(line)
+            if len(batch) >= STREAM_CHUNK_ROWS:
+                self._write_chunk("".join(batch).encode('utf-8'))
+                batch = []
+        if batch:
+            self._write_chunk("".join(batch).encode('utf-8'))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+
+    def _read_body(self):
+        """Parse a JSON or NDJSON request body"""
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise ValueError("Request body too large")
+        raw = self.rfile.read(length).decode('utf-8') if length else ""
+        self._body_read = True
+        if "ndjson" in (self.headers.get("Content-Type") or ""):
+            return [json.loads(line) for line in raw.splitlines() if line.strip()]
+        return json.loads(raw) if raw else {}
+
+    def _credentials(self):
+        return resolve_mode(self.headers.get("X-Password"), self.headers.get("X-Username"))
+
+    def end_headers(self):
+        # An unread request body would be parsed as the next keep-alive request, so close instead
+        headers = getattr(self, 'headers', None)
+        if headers is not None and not self._body_read and int(headers.get("Content-Length") or 0):
+            self.send_header("Connection", "close")
+        super().end_headers()
+
+    def _dispatch(self, method):
+        self._body_read = False
+        parsed = urlparse(self.path)
+        params = parse_qs(parsed.query)
+        store = self.server.store
+        try:
+            if method == "GET" and parsed.path == "/health":
+                return self._send_json(200, {"status": "ok"})
+            mode, username = self._credentials()
+
+            if method == "GET" and parsed.path == "/links":
+                tags = [t for t in params.get("tags", [""])[0].split(",") if t.strip()]
+                limit = int(params["limit"][0]) if "limit" in params else None
+                df = store.search(mode, username, params.get("q", [""])[0], tags, limit)
+                return self._send_stream(iter_ndjson(df))
+            if method == "GET" and parsed.path == "/export":
+                if params.get("format", ["xlsx"])[0] == "ndjson":
+                    return self._send_stream(iter_ndjson(store.search(mode, username)))
+                return self._send_bytes(
+                    store.export_excel(mode, username),
+                    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    f"{mode}_links.xlsx"
+                )
+            if method == "GET" and parsed.path == "/guests":
+                if mode != "owner":
+                    raise AuthError("Guest statistics are available to the owner only")
+                return self._send_stream(iter_ndjson(app.guest_stats()))
+            if method == "POST" and parsed.path == "/links":
+                actions = store.add(mode, username, [self._read_body()])
+                return self._send_json(200, {"action": actions[0]})
+            if method == "POST" and parsed.path == "/links/batch":
+                body = self._read_body()
+                links = body.get("links", []) if isinstance(body, dict) else body
+                actions = store.add(mode, username, links)
+                return self._send_json(200, {
+                    "saved": actions.count("saved"),
+                    "updated": actions.count("updated"),
+                    "actions": actions
+                })
+            if method in ("POST", "DELETE") and parsed.path == "/links/delete":
+                body = self._read_body()
+                urls = body.get("urls", []) if isinstance(body, dict) else body
+                if not isinstance(urls, list) or not all(isinstance(url, str) for url in urls):
+                    raise ValueError("Expected a list of URLs or {\"urls\": [...]}")
+                return self._send_json(200, {"deleted": store.delete(mode, username, urls)})
+            return self._send_json(404, {"error": f"No route for {method} {parsed.path}"})
+        except AuthError as e:
+            return self._send_json(401, {"error": str(e)})
+        except (ValueError, KeyError, TypeError) as e:
+            return self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            logging.error(f"API request failed: {str(e)}")
+            return self._send_json(500, {"error": str(e)})
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+def serve(host="127.0.0.1", port=8502, max_connections=64):
+    """Run the HTTP API until interrupted"""
+    server = LinkAPIServer((host, port), LinkAPIHandler, LinkStore(), max_connections)
+    logging.info(f"Web Content Manager API listening on http://{host}:{port} "
+                 f"(up to {max_connections} connections)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def _read_links_file(path):
+    """Links from a JSON array or NDJSON file ('-' for stdin)"""
+    handle = sys.stdin if path == "-" else open(path, encoding='utf-8')
+    try:
+        raw = handle.read()
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+    if raw.lstrip().startswith("["):
+        return json.loads(raw)
+    return [json.loads(line) for line in raw.splitlines() if line.strip()]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Web Content Manager headless API and CLI")
+    parser.add_argument("--password", default=os.environ.get("WCM_PASSWORD"), help="Owner or guest password")
+    parser.add_argument("--username", default=os.environ.get("WCM_USERNAME"), help="Guest username")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_cmd = commands.add_parser("serve", help="Run the HTTP API")
+    serve_cmd.add_argument("--host", default="127.0.0.1")
+    serve_cmd.add_argument("--port", type=int, default=8502)
+    serve_cmd.add_argument("--max-connections", type=int, default=64,
+                           help="Concurrent connections before new ones get 503")
+
+    add_cmd = commands.add_parser("add", help="Save or update one link")
+    add_cmd.add_argument("url")
+    add_cmd.add_argument("--title", required=True)
+    add_cmd.add_argument("--description", default="")
+    add_cmd.add_argument("--tags", default="", help="Comma separated tags")
+
+    import_cmd = commands.add_parser("import", help="Save links from a JSON or NDJSON file")
+    import_cmd.add_argument("path", help="File path, or - for stdin")
+
+    search_cmd = commands.add_parser("search", help="Print matching links as NDJSON")
+    search_cmd.add_argument("query", nargs="?", default="")
+    search_cmd.add_argument("--tags", default="", help="Comma separated tags")
+    search_cmd.add_argument("--limit", type=int)
+
+    delete_cmd = commands.add_parser("delete", help="Delete links by URL")
+    delete_cmd.add_argument("urls", nargs="+")
+
+    export_cmd = commands.add_parser("export", help="Export links as Excel or NDJSON")
+    export_cmd.add_argument("--output", help="Excel file to write; NDJSON to stdout when omitted")
+
+    commands.add_parser("guests", help="Print per-guest link counts as NDJSON (owner only)")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        serve(args.host, args.port, args.max_connections)
+        return 0
+
+    try:
+        mode, username = resolve_mode(args.password, args.username)
+    except AuthError as e:
+        parser.error(str(e))
+    store = LinkStore()
+
+    if args.command == "add":
+        tags = [t for t in args.tags.split(",") if t.strip()]
+        actions = store.add(mode, username, [{
+            'url': args.url, 'title': args.title, 'description': args.description, 'tags': tags
+        }])
+        print(f"Link {actions[0]}")
+    elif args.command == "import":
+        actions = store.add(mode, username, _read_links_file(args.path))
+        print(f"Saved {actions.count('saved')}, updated {actions.count('updated')} link(s)")
+    elif args.command == "search":
+        tags = [t for t in args.tags.split(",") if t.strip()]
+        sys.stdout.writelines(iter_ndjson(store.search(mode, username, args.query, tags, args.limit)))
+    elif args.command == "delete":
+        print(f"Deleted {store.delete(mode, username, args.urls)} link(s)")
+    elif args.command == "guests":
+        if mode != "owner":
+            parser.error("Guest statistics are available to the owner only")
+        sys.stdout.writelines(iter_ndjson(app.guest_stats()))
+    elif args.command == "export":
+        if args.output:
+            with open(args.output, 'wb') as f:
+                f.write(store.export_excel(mode, username))
+            print(f"Exported to {args.output}")
+        else:
+            sys.stdout.writelines(iter_ndjson(store.search(mode, username)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())